@@ -1,8 +1,25 @@
 """ Entry point for the matching engine """
 
-from collections import defaultdict
-from matching_engine import MatchingEngine
+import struct
+import sys
+from matching_engine import engine
 from excepts import InvalidInputError
+from parsed_order import SUB, CXL
+
+# binary record layouts, all little-endian without padding
+#   SUB: action, type code, side code, order_id, quantity, price (-1 if none)
+#   CXL: action, order_id
+SUB_RECORD = 0
+CXL_RECORD = 1
+_SUB = struct.Struct("<BBBQIi")
+_CXL = struct.Struct("<BQ")
+_RECORD_SIZES = {SUB_RECORD: _SUB.size, CXL_RECORD: _CXL.size}
+ORDER_TYPE_CODES = ("LO", "MO", "IOC", "FOK", "GTC")
+SIDE_CODES = ("B", "S")
+# the only order type whose records may carry no price
+_MO_CODE = ORDER_TYPE_CODES.index("MO")
+# size of each read from a binary stream
+_CHUNK_SIZE = 65536
 
 
 def parse_order(order):
@@ -10,45 +27,135 @@ def parse_order(order):
     Args:
         order: the order string to be parsed, one of the following formats
             - SUB, type, side, order_id, quantity, price
+            - SUB, MO, side, order_id, quantity (market orders have no price)
             - CXL order_id
     Returns:
-        the order defaultdict
+        the parsed order tuple
     Raises:
         InvalidInputError: if the input is not of the correct format
     """
-    order_dict = defaultdict(lambda: None)
     order_list = order.split()
+    # every format has a distinct number of tokens, the action is only validated
+    token_count = len(order_list)
 
-    order_dict["action"] = order_list[0]
-
-    if order_dict["action"] == "CXL":
-        order_dict["id"] = order_list[1]
-    elif order_dict["action"] == "SUB":
-        order_dict["type"] = order_list[1]
-        order_dict["side"] = order_list[2]
-        order_dict["id"] = order_list[3]
-        order_dict["quantity"] = int(order_list[4])
-        try:
-            # some orders may not have a price
-            order_dict["price"] = int(order_list[5])
-        except IndexError:
-            pass
-    else:
-        raise InvalidInputError()
+    if token_count == 6 and order_list[0] == SUB:
+        return (
+            SUB,
+            sys.intern(order_list[1]),
+            sys.intern(order_list[2]),
+            order_list[3],
+            int(order_list[4]),
+            int(order_list[5]),
+        )
+    if token_count == 2 and order_list[0] == CXL:
+        return (CXL, None, None, order_list[1], 0, None)
+    # only a market order may omit its price
+    if token_count == 5 and order_list[0] == SUB and order_list[1] == "MO":
+        return (
+            SUB,
+            sys.intern(order_list[1]),
+            sys.intern(order_list[2]),
+            order_list[3],
+            int(order_list[4]),
+            None,
+        )
+    raise InvalidInputError()
 
-    return order_dict
 
+def parse_order_binary(buf, offset=0):
+    """Parses the order from a fixed width binary record
+    Args:
+        buf: bytes-like object holding the record
+        offset: position of the record in buf
+    Returns:
+        the parsed order tuple
+    Raises:
+        InvalidInputError: if the record action, type code or side code is unknown,
+            or if a record other than a market order has no price
+    """
+    action = buf[offset]
 
-if __name__ == "__main__":
-    matching_engine = MatchingEngine.get_instance()
+    if action == CXL_RECORD:
+        _, order_id = _CXL.unpack_from(buf, offset)
+        return (CXL, None, None, str(order_id), 0, None)
+    if action == SUB_RECORD:
+        _, type_code, side_code, order_id, quantity, price = _SUB.unpack_from(
+            buf, offset
+        )
+        # the codes are unsigned bytes, only the upper bound can be exceeded
+        if type_code >= len(ORDER_TYPE_CODES) or side_code >= len(SIDE_CODES):
+            raise InvalidInputError()
+        if price < 0 and type_code != _MO_CODE:
+            raise InvalidInputError()
+        return (
+            SUB,
+            ORDER_TYPE_CODES[type_code],
+            SIDE_CODES[side_code],
+            str(order_id),
+            quantity,
+            price if price >= 0 else None,
+        )
+    raise InvalidInputError()
+
+
+def read_binary_orders(stream):
+    """Reads binary records from a stream in fixed size chunks
+    Args:
+        stream: binary stream supporting read1, e.g. sys.stdin.buffer
+    Yields:
+        the parsed order tuple of every record in the stream
+    Raises:
+        InvalidInputError: if a record is unknown or truncated
+    """
+    buf = b""
     while True:
-        line = input()
+        chunk = stream.read1(_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+        offset = 0
+        while offset < len(buf):
+            size = _RECORD_SIZES.get(buf[offset])
+            if size is None:
+                raise InvalidInputError()
+            if offset + size > len(buf):
+                # the rest of the record is in the next chunk
+                break
+            yield parse_order_binary(buf, offset)
+            offset += size
+        buf = buf[offset:]
+
+    if buf:
+        raise InvalidInputError()
+
+
+def main():
+    """Reads orders from stdin and writes the result of processing each one"""
+    # bind the engine's hot attributes to locals for the input loop
+    order_book = engine.order_book
+    process_order = engine.process_order
+    # stdout stays block buffered when redirected, input() would flush it per line
+    write = sys.stdout.write
+
+    if sys.argv[1:] == ["--binary"]:
+        # replay binary records until the end of input
+        for parsed_order in read_binary_orders(sys.stdin.buffer):
+            write(f"{process_order(parsed_order)}\n")
+        write(f"{order_book}\n")
+        return
+
+    for line in sys.stdin:
+        line = line.rstrip("\n")
         if line == "END":
-            print(matching_engine.order_book)
+            write(f"{order_book}\n")
             break
         if line == "ODR":
-            print(matching_engine.order_book)
+            write(f"{order_book}\n")
             continue
 
-        order_dict = parse_order(line)
-        print(matching_engine.process_order(order_dict))
+        parsed_order = parse_order(line)
+        write(f"{process_order(parsed_order)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,3 @@
 
 class InvalidInputError(Exception):
     """Defines Invalid Input Exception"""
-
-
-class SingletonConstructorCallError(Exception):
-    """Defines Singleton Constructor Call Exception"""
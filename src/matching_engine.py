@@ -1,12 +1,13 @@
 """file defines MatchingEngine"""
 
 from order_book import OrderBook
-from order_factory import OrderFactory
-from excepts import SingletonConstructorCallError
+from order_factory import create_order
+from excepts import InvalidInputError
+from parsed_order import SUB, CXL
 
 
 class MatchingEngine:
-    """Defines a Singleton class for Matching Engine.
+    """Defines a class for Matching Engine.
 
     A Matching Engine is responsible to coordinate the orders that are
     received on the platform. Every order is processed according to the
@@ -14,54 +15,41 @@ class MatchingEngine:
     It maintains an order book to track the received orders.
     An order can be submitted to the orderbook or be cancelled using
     the order id.
+    The module creates the single shared instance, engine, on import.
 
     Attributes:
-        __instance: class member, the singleton instance.
+        order_book: OrderBook of the resting orders.
     """
 
-    __instance = None
-
-    @classmethod
-    def get_instance(cls):
-        """creates a singleton instance of MatchingEngine
-
-        Args: None
-        Returns:
-            MatchingEngine instance
-        """
-        if MatchingEngine.__instance is None:
-            MatchingEngine()
-        return MatchingEngine.__instance
-
     def __init__(self):
         """inits MatchingEngine
 
         Args: None
         Returns: None
-        Raises:
-            Exception -> This is a singleton.
         """
-        if MatchingEngine.__instance is not None:
-            raise SingletonConstructorCallError
-
         self.order_book = OrderBook()
-        MatchingEngine.__instance = self
 
-    def process_order(self, order_dict):
+    def process_order(self, parsed_order):
         """Processes an order
 
-        Args: order_dict, the defaultdict order from the parsed user input.
+        Args: parsed_order, the parsed order tuple from the user input.
         Returns:
             -Total Sale: Float if SUB
             -0/1 if CXL
+        Raises:
+            InvalidInputError: if the action is neither SUB nor CXL
         """
+        action, order_type, side, uid, quantity, price = parsed_order
 
-        if order_dict['action'] == "CXL":
-            return self.order_book.cancel_order(order_dict['id'])
+        if action is CXL:
+            return self.order_book.cancel_order(uid)
 
-        order = OrderFactory.create_order(order_dict["type"], order_dict)
-
-        if order.action == "SUB":
+        if action is SUB:
+            order = create_order(order_type, uid, side, quantity, price)
             return order.execute(self.order_book)
 
-        
+        raise InvalidInputError()
+
+
+# the engine shared by every importer of this module
+engine = MatchingEngine()
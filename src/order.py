@@ -1,322 +1,241 @@
 """file defines various types of orders"""
 
-from abc import ABC, abstractmethod
+import math
+import sys
 
-MANDATED_FULL_EXECUTION_ORDERS = {"LO", "FOK"}
+from excepts import InvalidInputError
 
+# interned sides, parsed sides are interned too so they compare by identity
+BUY = sys.intern("B")
+SELL = sys.intern("S")
 
-class Order(ABC):
-    """Defines an abstract type for an order
+
+class Order:
+    """Defines a base type for an order
 
     An order is any transaction that is carried out by the matching engine.
     There are different types of orders and each has a different behavior of getting executed.
     However, all the orders are expected to get executed depending on the attributes defined below.
+    Each order type defines _execute(opposite_queue, own_queue), which matches the
+    order against the opposite PriceQueue, rests any remainder its type keeps in
+    own_queue, and returns the total sale as float.
 
     Attributes:
         uid: A unique identifier string for the order
-        type: A string indicating type of the order, possible values:
+        type: A class-level string indicating type of the order, possible values:
             -LO: Limit Order
+            -MO: Market Order
+            -IOC: Immediate Or Cancel Order
+            -FOK: Fill Or Kill Order
+            -GTC: Good Till Cancelled Order
         side: A string indicating the side of the order, possible values:
             -B: Buy Order
             -S: Sell Order
         quantity: An int indicating no of units requested for trade
-        price: A float indicating the price of each unit
+        price: An int indicating the price of each unit
+        full_execution: A class-level flag, True for order types that must be
+            executed fully once they rest in the order book (LO, FOK)
     """
 
-    # pylint: disable=C0103
-    def __init__(self, action, uid, type, side, quantity, price):
+    __slots__ = ("uid", "side", "quantity", "price")
+    type = None
+    full_execution = False
+
+    def __init__(self, uid, side, quantity, price):
         """Inits Order class and its attributes"""
-        self.action = action
         self.uid = uid
-        self.type = type
         self.side = side
         self.quantity = quantity
         self.price = price
 
-        super().__init__()
-
-    def __lt__(self, other):
-        """defines less than operator for order comparision"""
-        return self.price < other.price
-
-    @abstractmethod
-    def __str__(self):
-        """Abstract method enables string rep of the order"""
-
-    @abstractmethod
-    def _execute_sell_order(self, order_book):
-        """Private abstract method enables sell order execution"""
-        return
-
-    @abstractmethod
-    def _execute_buy_order(self, order_book):
-        """Private abstract method enables buy order execution"""
-        return
-
-    @abstractmethod
-    def execute(self, order_book):
-        """Abstract method enables order execution"""
-        return
-
-
-class LimitOrder(Order):
-    """Defines a Limit Order which is an Order type.
-
-    A Limit order either gets fully executed or is not executed at all.
-    If a buy limit order is requested, it is matched with the sell queue in the order book.
-    If the sell price <= buy price, the order gets executed.
-    Otherwise, it is added to the buy queue in the order book.
-    If a sell limit order is requested, it is matched with the buy queue in the order book.
-    If the buy price >= sell price, the order gets executed.
-    Otherwise, it is added to the sell queue in the order book.
-
-    Attributes:
-        Same as the parent class.
-    """
-
     def __str__(self):
         return f"({self.uid} {self.type} {self.side} {self.quantity} {self.price})"
 
     def execute(self, order_book):
-        """Executes a Limit Order
+        """Executes the order against the opposite queue of the order book
 
         Args:
             order_book: OrderBook object to manage the buy/sell queue.
         Returns:
             The total sale as float
+        Raises:
+            InvalidInputError: if the side is neither B nor S
         """
-        if self.side == "B":
-            return self._execute_buy_order(order_book)
-        if self.side == "S":
-            return self._execute_sell_order(order_book)
+        if self.side is BUY:
+            return self._execute(order_book.sell, order_book.buy)
+        if self.side is SELL:
+            return self._execute(order_book.buy, order_book.sell)
+        raise InvalidInputError()
+
+    def _can_fill(self, queue):
+        """Checks that the order can be fully executed, without mutating the queue
 
-    def _execute_buy_order(self, order_book):
-        """Executes a buy limit order.
+        Crossing levels are taken whole from their aggregate quantity, the orders
+        are only visited in a level that is deeper than the remaining quantity.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            queue: opposite PriceQueue the order is matched against
         Returns:
-            The total sale as float
+            True if the crossing orders can fill the whole quantity
         """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # maintain a history of orders executed
-        sell_orders = []
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-        # track the quantity remaining to buy
-        buy_quantity = self.quantity
+        # track the quantity remaining to trade
+        quantity = self.quantity
+        # prices are compared as heap keys, which puts both sides in ascending order
+        limit_key = queue.sign * self.price
 
-        while order_book.sell and buy_quantity > 0:
-            curr_sell_order = order_book.pop_sell()
-            if curr_sell_order.price > self.price:
-                sell_orders.append(curr_sell_order)
+        for key, level in queue.iter_levels():
+            if key > limit_key:
                 break
-            if (
-                curr_sell_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_sell_order.quantity > buy_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_sell_order)
+            level_quantity = level.quantity
+            if level_quantity <= quantity:
+                # every order of the level can be completely executed
+                quantity -= level_quantity
+                if quantity == 0:
+                    return True
                 continue
-            if curr_sell_order.quantity > buy_quantity:
-                # this will happen only when buy order gets completed, handle the residue
-                total_sale += buy_quantity * curr_sell_order.price
-                curr_sell_order.quantity -= buy_quantity
-                order_book.push_to_sell_queue(curr_sell_order)
-            else:
-                # buy quantity still left, curr_sell_order is completely executed
-                total_sale += curr_sell_order.quantity * curr_sell_order.price
-
-            # update buy quantity
-            buy_quantity -= min(buy_quantity, curr_sell_order.quantity)
-            sell_orders.append(curr_sell_order)
-
-        if buy_quantity > 0:
-            # restore the orders
-            for order in reversed(sell_orders):
-                order_book.push_to_sell_queue(order)
-            # add the current order to queue
-            order_book.push_to_buy_queue(self)
-            # reset total_sale
-            total_sale = 0.0
+            for curr_order in level:
+                resting_quantity = curr_order.quantity
+                if curr_order.full_execution and resting_quantity > quantity:
+                    continue
+                if resting_quantity >= quantity:
+                    return True
+                quantity -= resting_quantity
 
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_sell_queue(order)
+        return quantity == 0
 
-        return total_sale
+    def _fill(self, queue, limit_price):
+        """Executes the order against the queue, up to a limit price
 
-    def _execute_sell_order(self, order_book):
-        """Executes a sell limit order.
+        Resting orders are consumed from the front of the best level, a partially
+        executed one is updated in place and keeps its place in the queue.
+        The quantity that could not be executed is left on the order.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            queue: opposite PriceQueue the order is matched against
+            limit_price: worst price the order can be executed at
         Returns:
             The total sale as float
         """
         # initialize total sale to 0.0
         total_sale = 0.0
-        # maintain a history of orders executed
-        buy_orders = []
         # maintain a list of skipped mandated full execution
         full_execution_orders = []
-        # track the quantity remaining to sell
-        sell_quantity = self.quantity
-
-        while order_book.buy and sell_quantity > 0:
-            curr_buy_order = order_book.pop_buy()
-            if curr_buy_order.price < self.price:
-                buy_orders.append(curr_buy_order)
+        # track the quantity remaining to trade
+        quantity = self.quantity
+        # prices are compared as heap keys, which puts both sides in ascending order
+        limit_key = queue.sign * limit_price
+        # the heap and the levels are only ever mutated in place, safe to bind
+        heap = queue.heap
+        levels = queue.levels
+        pop = queue.pop
+        while heap and quantity > 0:
+            key = heap[0]
+            if key > limit_key:
                 break
-            if (
-                curr_buy_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_buy_order.quantity > sell_quantity
-            ):
+            level = levels[key]
+            curr_order = level[0]
+            resting_price = curr_order.price
+            level_quantity = level.quantity
+            if level_quantity <= quantity:
+                # every order of the level is completely executed, none can be skipped
+                total_sale += level_quantity * resting_price
+                quantity -= level_quantity
+                queue.pop_level()
+                continue
+            resting_quantity = curr_order.quantity
+            if curr_order.full_execution and resting_quantity > quantity:
                 # add to full execution orders
-                full_execution_orders.append(curr_buy_order)
+                full_execution_orders.append(pop())
                 continue
-            if curr_buy_order.quantity > sell_quantity:
-                # this will happen only when sell order gets completed, handle the residue
-                total_sale += sell_quantity * curr_buy_order.price
-                curr_buy_order.quantity -= sell_quantity
-                order_book.push_to_buy_queue(curr_buy_order)
-            else:
-                # sell quantity still left, curr_buy_order is completely executed
-                total_sale += curr_buy_order.quantity * curr_buy_order.price
-
-            # update sell quantity
-            sell_quantity -= min(sell_quantity, curr_buy_order.quantity)
-            buy_orders.append(curr_buy_order)
-
-        if sell_quantity > 0:
-            # restore the orders
-            for order in reversed(buy_orders):
-                order_book.push_to_buy_queue(order)
-            # add the current order to queue
-            order_book.push_to_sell_queue(self)
-            # reset total_sale
-            total_sale = 0.0
+            if resting_quantity > quantity:
+                # this will happen only when the order gets completed, handle the residue in place
+                total_sale += quantity * resting_price
+                curr_order.quantity = resting_quantity - quantity
+                level.quantity = level_quantity - quantity
+                quantity = 0
+                break
+            # quantity still left, curr_order is completely executed
+            total_sale += resting_quantity * resting_price
+            quantity -= resting_quantity
+            pop()
 
+        # keep the unfilled quantity on the order
+        self.quantity = quantity
         # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_buy_queue(order)
+        queue.restore_orders(full_execution_orders)
 
         return total_sale
 
 
-class MarketOrder(Order):
-    """Defines a Market Order which is an Order type.
+class LimitOrder(Order):
+    """Defines a Limit Order which is an Order type.
 
-    A Market order doesn't have a price and should be executed immediately, even if partially.
-    If a buy market order is requested, it is matched with the sell queue in the order book.
-    In case of no match, the remaining quantity is discarded.
+    A Limit order either gets fully executed or is not executed at all.
+    If a buy limit order is requested, it is matched with the sell queue in the order book.
+    If the sell price <= buy price, the order gets executed.
+    Otherwise, it is added to the buy queue in the order book.
     If a sell limit order is requested, it is matched with the buy queue in the order book.
-    In case of no match, the remaining quantity is discarded.
+    If the buy price >= sell price, the order gets executed.
+    Otherwise, it is added to the sell queue in the order book.
 
     Attributes:
         Same as the parent class.
     """
 
-    def __str__(self):
-        return f"({self.uid} {self.type} {self.side} {self.quantity})"
+    __slots__ = ()
+    type = "LO"
+    full_execution = True
 
-    def execute(self, order_book):
-        """Executes a Market Order
+    def _execute(self, opposite_queue, own_queue):
+        """Executes a limit order.
+
+        The opposite queue is checked without mutation first, so orders are only
+        consumed once the limit order is known to be fully executable.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            opposite_queue: PriceQueue the order is matched against
+            own_queue: PriceQueue the order rests in, if it is not executed
         Returns:
             The total sale as float
         """
-        if self.side == "B":
-            return self._execute_buy_order(order_book)
-        if self.side == "S":
-            return self._execute_sell_order(order_book)
+        if not self._can_fill(opposite_queue):
+            # add the current order to queue
+            own_queue.push(self)
+            return 0.0
 
-    def _execute_buy_order(self, order_book):
-        """Executes a buy market order.
+        return self._fill(opposite_queue, self.price)
 
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to buy
-        buy_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
 
-        while order_book.sell and buy_quantity > 0:
-            curr_sell_order = order_book.pop_sell()
-            if (
-                curr_sell_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_sell_order.quantity > buy_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_sell_order)
-                continue
-            if curr_sell_order.quantity > buy_quantity:
-                # this will happen only when buy order gets completed, handle the residue
-                total_sale += buy_quantity * curr_sell_order.price
-                curr_sell_order.quantity -= buy_quantity
-                order_book.push_to_sell_queue(curr_sell_order)
-            else:
-                # buy quantity still left, curr_sell_order is completely executed
-                total_sale += curr_sell_order.quantity * curr_sell_order.price
-
-            # update buy quantity
-            buy_quantity -= min(buy_quantity, curr_sell_order.quantity)
+class MarketOrder(Order):
+    """Defines a Market Order which is an Order type.
 
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_sell_queue(order)
+    A Market order doesn't have a price and should be executed immediately, even if partially.
+    If a buy market order is requested, it is matched with the sell queue in the order book.
+    In case of no match, the remaining quantity is discarded.
+    If a sell limit order is requested, it is matched with the buy queue in the order book.
+    In case of no match, the remaining quantity is discarded.
 
-        return total_sale
+    Attributes:
+        Same as the parent class.
+    """
 
-    def _execute_sell_order(self, order_book):
-        """Executes a sell market order.
+    __slots__ = ()
+    type = "MO"
+
+    def __str__(self):
+        return f"({self.uid} {self.type} {self.side} {self.quantity})"
+
+    def _execute(self, opposite_queue, own_queue):
+        """Executes a market order.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            opposite_queue: PriceQueue the order is matched against
+            own_queue: PriceQueue of the order side, unused as the remainder is discarded
         Returns:
             The total sale as float
         """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to sell
-        sell_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-
-        while order_book.buy and sell_quantity > 0:
-            curr_buy_order = order_book.pop_buy()
-            if (
-                curr_buy_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_buy_order.quantity > sell_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_buy_order)
-                continue
-            if curr_buy_order.quantity > sell_quantity:
-                # this will happen only when sell order gets completed, handle the residue
-                total_sale += sell_quantity * curr_buy_order.price
-                curr_buy_order.quantity -= sell_quantity
-                order_book.push_to_buy_queue(curr_buy_order)
-            else:
-                # sell quantity still left, curr_buy_order is completely executed
-                total_sale += curr_buy_order.quantity * curr_buy_order.price
-
-            # update sell quantity
-            sell_quantity -= min(sell_quantity, curr_buy_order.quantity)
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_buy_queue(order)
-
-        return total_sale
+        # a market order takes any price, the signed infinite price maps to an infinite key
+        return self._fill(opposite_queue, opposite_queue.sign * math.inf)
 
 
 class IOCOrder(Order):
@@ -332,111 +251,20 @@ class IOCOrder(Order):
         Same as the parent class.
     """
 
-    def __str__(self):
-        return f"({self.uid} {self.type} {self.side} {self.quantity} {self.price})"
-
-    def execute(self, order_book):
-        """Executes an IOC Order
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        if self.side == "B":
-            return self._execute_buy_order(order_book)
-        if self.side == "S":
-            return self._execute_sell_order(order_book)
-
-    def _execute_buy_order(self, order_book):
-        """Executes a buy IOC order.
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to buy
-        buy_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-
-        while order_book.sell and buy_quantity > 0:
-            curr_sell_order = order_book.pop_sell()
-            if curr_sell_order.price > self.price:
-                order_book.push_to_sell_queue(curr_sell_order)
-                break
-            if (
-                curr_sell_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_sell_order.quantity > buy_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_sell_order)
-                continue
-            if curr_sell_order.quantity > buy_quantity:
-                # this will happen only when buy order gets completed, handle the residue
-                total_sale += buy_quantity * curr_sell_order.price
-                curr_sell_order.quantity -= buy_quantity
-                order_book.push_to_sell_queue(curr_sell_order)
-            else:
-                # buy quantity still left, curr_sell_order is completely executed
-                total_sale += curr_sell_order.quantity * curr_sell_order.price
-
-            # update buy quantity
-            buy_quantity -= min(buy_quantity, curr_sell_order.quantity)
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_sell_queue(order)
+    __slots__ = ()
+    type = "IOC"
 
-        return total_sale
-
-    def _execute_sell_order(self, order_book):
-        """Executes a sell IOC order.
+    def _execute(self, opposite_queue, own_queue):
+        """Executes an IOC order.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            opposite_queue: PriceQueue the order is matched against
+            own_queue: PriceQueue of the order side, unused as the remainder is discarded
         Returns:
             The total sale as float
         """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to sell
-        sell_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-
-        while order_book.buy and sell_quantity > 0:
-            curr_buy_order = order_book.pop_buy()
-            if curr_buy_order.price < self.price:
-                order_book.push_to_buy_queue(curr_buy_order)
-                break
-            if (
-                curr_buy_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_buy_order.quantity > sell_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_buy_order)
-                continue
-            if curr_buy_order.quantity > sell_quantity:
-                # this will happen only when sell order gets completed, handle the residue
-                total_sale += sell_quantity * curr_buy_order.price
-                curr_buy_order.quantity -= sell_quantity
-                order_book.push_to_buy_queue(curr_buy_order)
-            else:
-                # sell quantity still left, curr_buy_order is completely executed
-                total_sale += curr_buy_order.quantity * curr_buy_order.price
-
-            # update sell quantity
-            sell_quantity -= min(sell_quantity, curr_buy_order.quantity)
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_buy_queue(order)
-
-        return total_sale
+        # the remaining quantity is discarded
+        return self._fill(opposite_queue, self.price)
 
 
 class FOKOrder(Order):
@@ -454,131 +282,27 @@ class FOKOrder(Order):
         Same as the parent class.
     """
 
-    def __str__(self):
-        return f"({self.uid} {self.type} {self.side} {self.quantity} {self.price})"
-
-    def execute(self, order_book):
-        """Executes a FOK Order
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        if self.side == "B":
-            return self._execute_buy_order(order_book)
-        if self.side == "S":
-            return self._execute_sell_order(order_book)
-
-    def _execute_buy_order(self, order_book):
-        """Executes a buy FOK order.
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # maintain a history of orders executed
-        sell_orders = []
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-        # track the quantity remaining to buy
-        buy_quantity = self.quantity
-
-        while order_book.sell and buy_quantity > 0:
-            curr_sell_order = order_book.pop_sell()
-            if curr_sell_order.price > self.price:
-                sell_orders.append(curr_sell_order)
-                break
-            if (
-                curr_sell_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_sell_order.quantity > buy_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_sell_order)
-                continue
-            if curr_sell_order.quantity > buy_quantity:
-                # this will happen only when buy order gets completed, handle the residue
-                total_sale += buy_quantity * curr_sell_order.price
-                curr_sell_order.quantity -= buy_quantity
-                order_book.push_to_sell_queue(curr_sell_order)
-            else:
-                # buy quantity still left, curr_sell_order is completely executed
-                total_sale += curr_sell_order.quantity * curr_sell_order.price
-
-            # update buy quantity
-            buy_quantity -= min(buy_quantity, curr_sell_order.quantity)
-            sell_orders.append(curr_sell_order)
-
-        if buy_quantity > 0:
-            # restore the orders
-            for order in reversed(sell_orders):
-                order_book.push_to_sell_queue(order)
-            # reset total_sale
-            total_sale = 0.0
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_sell_queue(order)
+    __slots__ = ()
+    type = "FOK"
+    full_execution = True
 
-        return total_sale
+    def _execute(self, opposite_queue, own_queue):
+        """Executes a FOK order.
 
-    def _execute_sell_order(self, order_book):
-        """Executes a sell FOK order.
+        The opposite queue is checked without mutation first, so orders are only
+        consumed once the FOK order is known to be fully executable.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            opposite_queue: PriceQueue the order is matched against
+            own_queue: PriceQueue of the order side, unused as the order never rests
         Returns:
             The total sale as float
         """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # maintain a history of orders executed
-        buy_orders = []
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-        # track the quantity remaining to sell
-        sell_quantity = self.quantity
-
-        while order_book.buy and sell_quantity > 0:
-            curr_buy_order = order_book.pop_buy()
-            if curr_buy_order.price < self.price:
-                buy_orders.append(curr_buy_order)
-                break
-            if (
-                curr_buy_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_buy_order.quantity > sell_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_buy_order)
-                continue
-            if curr_buy_order.quantity > sell_quantity:
-                # this will happen only when sell order gets completed, handle the residue
-                total_sale += sell_quantity * curr_buy_order.price
-                curr_buy_order.quantity -= sell_quantity
-                order_book.push_to_buy_queue(curr_buy_order)
-            else:
-                # sell quantity still left, curr_buy_order is completely executed
-                total_sale += curr_buy_order.quantity * curr_buy_order.price
-
-            # update sell quantity
-            sell_quantity -= min(sell_quantity, curr_buy_order.quantity)
-            buy_orders.append(curr_buy_order)
-
-        if sell_quantity > 0:
-            # restore the orders
-            for order in reversed(buy_orders):
-                order_book.push_to_buy_queue(order)
-            # reset total_sale
-            total_sale = 0.0
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_buy_queue(order)
+        if not self._can_fill(opposite_queue):
+            # the order is discarded
+            return 0.0
 
-        return total_sale
+        return self._fill(opposite_queue, self.price)
 
 
 class GTCOrder(Order):
@@ -596,120 +320,22 @@ class GTCOrder(Order):
         Same as the parent class.
     """
 
-    def __str__(self):
-        return f"({self.uid} {self.type} {self.side} {self.quantity} {self.price})"
-
-    def execute(self, order_book):
-        """Executes a GTC Order
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        if self.side == "B":
-            return self._execute_buy_order(order_book)
-        if self.side == "S":
-            return self._execute_sell_order(order_book)
-
-    def _execute_buy_order(self, order_book):
-        """Executes a GTC limit order.
-
-        Args:
-            order_book: OrderBook object to manage the buy/sell queue.
-        Returns:
-            The total sale as float
-        """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to buy
-        buy_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
-
-        while order_book.sell and buy_quantity > 0:
-            curr_sell_order = order_book.pop_sell()
-            if curr_sell_order.price > self.price:
-                order_book.push_to_sell_queue(curr_sell_order)
-                break
-            if (
-                curr_sell_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_sell_order.quantity > buy_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_sell_order)
-                continue
-            if curr_sell_order.quantity > buy_quantity:
-                # this will happen only when buy order gets completed, handle the residue
-                total_sale += buy_quantity * curr_sell_order.price
-                curr_sell_order.quantity -= buy_quantity
-                order_book.push_to_sell_queue(curr_sell_order)
-            else:
-                # buy quantity still left, curr_sell_order is completely executed
-                total_sale += curr_sell_order.quantity * curr_sell_order.price
-
-            # update buy quantity
-            buy_quantity -= min(buy_quantity, curr_sell_order.quantity)
-
-        if buy_quantity > 0:
-            # update the remaining quantity
-            self.quantity = buy_quantity
-            # push to buy queue
-            order_book.push_to_buy_queue(self)
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_sell_queue(order)
-
-        return total_sale
+    __slots__ = ()
+    type = "GTC"
 
-    def _execute_sell_order(self, order_book):
-        """Executes a sell GTC order.
+    def _execute(self, opposite_queue, own_queue):
+        """Executes a GTC order.
 
         Args:
-            order_book: OrderBook object to manage the buy/sell queue.
+            opposite_queue: PriceQueue the order is matched against
+            own_queue: PriceQueue the remaining quantity rests in
         Returns:
             The total sale as float
         """
-        # initialize total sale to 0.0
-        total_sale = 0.0
-        # track the quantity remaining to sell
-        sell_quantity = self.quantity
-        # maintain a list of skipped mandated full execution
-        full_execution_orders = []
+        total_sale = self._fill(opposite_queue, self.price)
 
-        while order_book.buy and sell_quantity > 0:
-            curr_buy_order = order_book.pop_buy()
-            if curr_buy_order.price < self.price:
-                order_book.push_to_buy_queue(curr_buy_order)
-                break
-            if (
-                curr_buy_order.type in MANDATED_FULL_EXECUTION_ORDERS
-                and curr_buy_order.quantity > sell_quantity
-            ):
-                # add to full execution orders
-                full_execution_orders.append(curr_buy_order)
-                continue
-            if curr_buy_order.quantity > sell_quantity:
-                # this will happen only when sell order gets completed, handle the residue
-                total_sale += sell_quantity * curr_buy_order.price
-                curr_buy_order.quantity -= sell_quantity
-                order_book.push_to_buy_queue(curr_buy_order)
-            else:
-                # sell quantity still left, curr_buy_order is completely executed
-                total_sale += curr_buy_order.quantity * curr_buy_order.price
-
-            # update sell quantity
-            sell_quantity -= min(sell_quantity, curr_buy_order.quantity)
-
-        if sell_quantity > 0:
-            # update the remaining quantity
-            self.quantity = sell_quantity
-            # add the current order to queue
-            order_book.push_to_sell_queue(self)
-
-        # restore mandated full execution orders
-        for order in full_execution_orders:
-            order_book.push_to_buy_queue(order)
+        if self.quantity > 0:
+            # add the remaining quantity to the queue
+            own_queue.push(self)
 
         return total_sale
@@ -1,60 +1,223 @@
 """file defines OrderBook"""
 
 import heapq
+from collections import deque
+from itertools import chain
+from operator import attrgetter, itemgetter
 
+from order import BUY
 
-class OrderBook:
-    """Class representing the Order book.
+_get_quantity = attrgetter("quantity")
+_get_level = itemgetter(1)
 
-    An order book maintains two separate queues to track the submitted orders.
-    The buy queue is a priority queue (max heap) sorted by order price.
-    The sell queue is a priority queue (min heap) sorted by order price.
-    The order queue exposes APIs to push-to or pop-from these queues.
-    Given an order id, it should be possible to cancel the corresponding order.
+
+class _Level(deque):
+    """FIFO queue of the orders resting at one price, with their total quantity
 
     Attributes:
-        None
+        quantity: sum of the quantities of the orders in the queue
     """
 
+    __slots__ = ("quantity",)
+
     def __init__(self):
-        """Inits OrderBook class, initializes empty buy and sell queues"""
-        # descending
-        self.buy = []
-        # ascending
-        self.sell = []
+        """Inits an empty price level"""
+        super().__init__()
+        self.quantity = 0
 
-    def __str__(self):
-        """returns string representation of the object"""
-        buy_str = f"BUY Queue: [{', '.join(list(map(str, [buyorder[1] for buyorder in self.buy])))}]"
-        sell_str = f"SELL Queue: [{', '.join(list(map(str, [sellorder[1] for sellorder in self.sell])))}]"
-        return buy_str + "\n" + sell_str
 
-    def push_to_buy_queue(self, order):
-        """Pushes an order to buy queue
+def _push_keys(heap, keys):
+    """Pushes new price keys, with a single heapify when it beats pushing them one by one
+
+    Args:
+        heap: heap of price keys
+        keys: list of price keys missing from the heap
+    """
+    if len(keys) * len(heap).bit_length() > len(heap):
+        heap.extend(keys)
+        heapq.heapify(heap)
+    else:
+        for key in keys:
+            heapq.heappush(heap, key)
+
+
+class PriceQueue:
+    """Class representing one side of the Order book.
+
+    Orders are grouped in price levels, each level owns a FIFO queue of the orders
+    resting at that price, so the best order can be inspected and consumed without
+    reordering the heap. Levels are keyed by the signed price (sign * price), which
+    keeps the best level on top of a min heap for both sides.
+
+    Attributes:
+        sign: 1 for the sell queue (ascending prices), -1 for the buy queue (descending)
+        heap: heap of price keys, best price on top
+        levels: dictionary mapping a price key to its price level
+        dead_levels: number of levels emptied by cancels since the heap was last rebuilt
+        orders: dictionary mapping the uid of every resting order to the order,
+            shared by both queues of the order book
+    """
+
+    def __init__(self, sign, orders):
+        """Inits an empty PriceQueue
 
         Args:
-            order: Order object
+            sign: 1 for the sell queue, -1 for the buy queue
+            orders: uid index of the order book
         """
-        heapq.heappush(self.buy, (-order.price, order))
+        self.sign = sign
+        self.heap = []
+        self.levels = {}
+        self.dead_levels = 0
+        self.orders = orders
 
-    def push_to_sell_queue(self, order):
-        """Pushes an order to sell queue
+    def push(self, order):
+        """Pushes an order to the back of its price level
 
         Args:
             order: Order object
         """
-        heapq.heappush(self.sell, (order.price, order))
+        key = self.sign * order.price
+        level = self.levels.get(key)
+        if level is None:
+            level = self.levels[key] = _Level()
+            heapq.heappush(self.heap, key)
+        level.append(order)
+        level.quantity += order.quantity
+        self.orders[order.uid] = order
+
+    def restore_orders(self, orders):
+        """Puts popped orders back at the front of their price levels
 
-    def pop_buy(self):
-        """Pops an order from buy queue"""
-        return heapq.heappop(self.buy)[1]
+        Args:
+            orders: list of Order objects, in the order they were popped
+        """
+        new_keys = []
+        for order in reversed(orders):
+            key = self.sign * order.price
+            level = self.levels.get(key)
+            if level is None:
+                level = self.levels[key] = _Level()
+                new_keys.append(key)
+            level.appendleft(order)
+            level.quantity += order.quantity
+            # a cancelled order stays out of the index
+            if order.quantity:
+                self.orders[order.uid] = order
+        if new_keys:
+            _push_keys(self.heap, new_keys)
+
+    def pop_level(self):
+        """Pops the best level and returns it"""
+        level = self.levels.pop(heapq.heappop(self.heap))
+        orders = self.orders
+        for order in level:
+            # a cancelled uid may have been reused by a newer resting order
+            if orders.get(order.uid) is order:
+                del orders[order.uid]
+        return level
+
+    def pop(self):
+        """Pops the first order of the best level"""
+        level = self.levels[self.heap[0]]
+        order = level.popleft()
+        level.quantity -= order.quantity
+        if not level:
+            del self.levels[heapq.heappop(self.heap)]
+        # a cancelled uid may have been reused by a newer resting order
+        if self.orders.get(order.uid) is order:
+            del self.orders[order.uid]
+        return order
+
+    def cancel(self, order):
+        """Clears the quantity of a resting order, it is dropped once it reaches the front
+
+        A level left with only cancelled orders stays in the heap until the matching
+        loops pop it. Once the levels emptied by cancels outnumber half of the heap,
+        the empty levels are dropped and the heap is rebuilt in a single pass.
 
-    def pop_sell(self):
-        """Pops an order from sell queue"""
-        return heapq.heappop(self.sell)[1]
+        Args:
+            order: Order object resting in this queue
+        """
+        level = self.levels[self.sign * order.price]
+        level.quantity -= order.quantity
+        order.quantity = 0
+        if not level.quantity:
+            self.dead_levels += 1
+            if 2 * self.dead_levels > len(self.heap):
+                self._drop_dead_levels()
+
+    def _drop_dead_levels(self):
+        """Drops the levels left without quantity and rebuilds the heap in place"""
+        heap = self.heap
+        levels = self.levels
+        for key in heap:
+            if not levels[key].quantity:
+                del levels[key]
+        # the matching loop binds the heap, it is only ever mutated in place
+        heap[:] = levels.keys()
+        heapq.heapify(heap)
+        self.dead_levels = 0
+
+    def iter_levels(self):
+        """Yields (price key, level) pairs, best price first, without mutating the queue
+
+        The heap is walked through an auxiliary frontier heap of indices, so the
+        levels can be visited in priority order without popping the heap itself.
+        """
+        heap = self.heap
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        while frontier:
+            key, idx = heapq.heappop(frontier)
+            yield key, self.levels[key]
+            for child in (2 * idx + 1, 2 * idx + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def iter_orders(self):
+        """Iterates over the orders in priority order without mutating the queue"""
+        return chain.from_iterable(map(_get_level, self.iter_levels()))
+
+
+class OrderBook:
+    """Class representing the Order book.
+
+    An order book maintains two price queues to track the submitted orders.
+    The buy queue is a priority queue (max heap) of buy prices.
+    The sell queue is a priority queue (min heap) of sell prices.
+    The order book exposes these queues to push-to or pop-from them.
+    Given an order id, it should be possible to cancel the corresponding order.
+    Cancellation is lazy: the order is looked up by id and left in its level with
+    no quantity, the matching loops then consume it like any fully executed order.
+
+    Attributes:
+        buy: PriceQueue of buy orders, best (highest) price on top
+        sell: PriceQueue of sell orders, best (lowest) price on top
+        orders: dictionary mapping the uid of every resting order to the order
+    """
+
+    def __init__(self):
+        """Inits OrderBook class, initializes empty buy and sell queues"""
+        self.orders = {}
+        # descending
+        self.buy = PriceQueue(-1, self.orders)
+        # ascending
+        self.sell = PriceQueue(1, self.orders)
+
+    def __str__(self):
+        """returns string representation of the object"""
+        # cancelled orders are left in place without quantity, skip them
+        buy_str = f"BUY Queue: [{', '.join(map(str, filter(_get_quantity, self.buy.iter_orders())))}]"
+        sell_str = f"SELL Queue: [{', '.join(map(str, filter(_get_quantity, self.sell.iter_orders())))}]"
+        return buy_str + "\n" + sell_str
 
     def cancel_order(self, order_id):
-        """Pops an order from sell queue
+        """Cancels an order in the buy or sell queue
+
+        The order is found through the uid index and marked as cancelled by
+        clearing its quantity, it is removed once it reaches the front of the queue.
 
         Args:
             order_id: uid of order
@@ -62,19 +225,11 @@ class OrderBook:
             1: Deletion successful
             0: Order not found.
         """
-        for idx, order in enumerate(self.sell):
-            if order[1].uid == order_id:
-                self.sell[idx] = self.sell[-1]
-                self.sell.pop()
-                heapq.heapify(self.sell)
-                # return at this point, no need to check buy queue
-                return 1
-
-        for idx, order in enumerate(self.buy):
-            if order[1].uid == order_id:
-                self.buy[idx] = self.buy[-1]
-                self.buy.pop()
-                heapq.heapify(self.buy)
-                return 1
-
-        return 0
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return 0
+        if order.side is BUY:
+            self.buy.cancel(order)
+        else:
+            self.sell.cancel(order)
+        return 1
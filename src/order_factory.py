@@ -2,6 +2,34 @@
 
 from order import LimitOrder, MarketOrder, IOCOrder, FOKOrder, GTCOrder
 
+# order type to Order class, every constructor takes the parsed fields positionally
+# and the type itself is a class attribute
+CREATE = {
+    "LO": LimitOrder,
+    "MO": MarketOrder,
+    "IOC": IOCOrder,
+    "FOK": FOKOrder,
+    "GTC": GTCOrder,
+}
+
+
+# the table is bound as a default argument, read as a local on every call
+def create_order(order_type, uid, side, quantity, price, _orders=CREATE):
+    """Creates the order object according to the type
+
+    Args:
+        order_type: type of the order as string
+        uid: unique identifier string of the order
+        side: side of the order as string
+        quantity: no of units requested for trade
+        price: price of each unit, None if absent
+        _orders: CREATE, bound when the function is defined
+
+    Returns:
+        order: Order object
+    """
+    return _orders[order_type](uid, side, quantity, price)
+
 
 class OrderFactory:
     """Defines a factory for creating Orders
@@ -10,37 +38,16 @@ class OrderFactory:
     the logic to client and referring to the newly created object using a
     common interface.
     This factory creates different types of Orders depending on the type.
+    Every class registered in the table must take (uid, side, quantity, price)
+    positionally and declare __slots__, orders are created for every submission
+    and may rest in the order book, so none of them should carry a __dict__.
 
     Attributes:
         submit_orders: a class attribute dictionary that maintains the
-        different types of orders.
+        different types of orders, the module level CREATE table.
+        create_order: the module level create_order function, kept on the
+        class for callers of the factory.
     """
 
-    submit_orders = {
-        "LO": LimitOrder,
-        "MO": MarketOrder,
-        "IOC": IOCOrder,
-        "FOK": FOKOrder,
-        "GTC": GTCOrder,
-    }
-
-    @classmethod
-    def create_order(cls, type, order_dict):
-        """Creates the order object according to the type
-
-        Args:
-            cls: OrderFactory class method
-            type: type of the order as string
-            order_dict: parsed order dictionary from input
-
-        Returns:
-            order: Order object
-        """
-        return cls.submit_orders[type](
-            order_dict["action"],
-            order_dict["id"],
-            order_dict["type"],
-            order_dict["side"],
-            order_dict["quantity"],
-            order_dict["price"],
-        )
+    submit_orders = CREATE
+    create_order = staticmethod(create_order)
@@ -0,0 +1,19 @@
+"""file defines the layout of a parsed order
+
+A parsed order is a plain tuple of six fields, in this order:
+    action: A string indicating the action, SUB or CXL
+    type: A string indicating the type of a submitted order, None for CXL
+    side: A string indicating the side of a submitted order, None for CXL
+    id: A unique identifier string for the order
+    quantity: An int indicating no of units requested for trade, 0 for CXL
+    price: An int indicating the price of each unit, None if absent
+
+The action, type and side strings are interned by the parsers, so they
+can be compared by identity against the module constants.
+"""
+
+import sys
+
+# interned actions, parsed actions compare to these by identity
+SUB = sys.intern("SUB")
+CXL = sys.intern("CXL")